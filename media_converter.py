@@ -1,22 +1,143 @@
+import io
+import json
+import multiprocessing
+import os
 import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from pathlib import Path
-from moviepy.editor import VideoFileClip, AudioFileClip
 from PIL import Image
 
+try:
+    import imageio_ffmpeg
+except ImportError:
+    imageio_ffmpeg = None
+
+try:
+    import numpy as np
+    import simplejpeg
+except ImportError:
+    np = simplejpeg = None
+
 VIDEO_EXTS = {".mp4", ".mov", ".avi", ".mkv", ".webm"}
 AUDIO_EXTS = {".mp3", ".wav", ".m4a", ".flac", ".ogg"}
 IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif", ".tiff"}
-
-summary = {
-    "converted": 0,
-    "copied": 0,
-    "skipped": 0,
-    "failed": 0
+EXT_TO_TYPE = ({ext: "video" for ext in VIDEO_EXTS}
+               | {ext: "audio" for ext in AUDIO_EXTS}
+               | {ext: "image" for ext in IMAGE_EXTS})
+OUTPUT_EXTS = {
+    "video": ("mp4", "mov", "avi", "mkv", "webm"),
+    "audio": ("mp3", "wav", "m4a", "flac", "ogg"),
+    "image": ("png", "jpg", "jpeg", "webp", "bmp", "gif", "tiff")
 }
-
-correct_format_files = []
-failed_files = []
-skipped_files = []
+JPEG_EXTS = {".jpg", ".jpeg"}
+JPEG_QUALITY = 90
+OPTIMIZE_JPEG = False
+JPEGTRAN = shutil.which("jpegtran")
+
+HW_VIDEO_ENCODERS = {
+    "h264": ("h264_nvenc", "h264_qsv", "h264_vaapi"),
+    "vp9": ("vp9_qsv", "vp9_vaapi")
+}
+HW_QUALITY_ARGS = {
+    "h264_nvenc": ["-rc", "vbr", "-cq", "23", "-b:v", "0", "-pix_fmt", "yuv420p"],
+    "h264_qsv": ["-global_quality", "23"],
+    "h264_vaapi": ["-rc_mode", "CQP", "-qp", "23"],
+    "vp9_qsv": ["-global_quality", "31"],
+    "vp9_vaapi": ["-rc_mode", "CQP", "-global_quality", "100"]
+}
+HW_ENCODE_SESSIONS = 2
+VAAPI_DEVICE = "/dev/dri/renderD128"
+CACHE_FILE = ".convert_cache.json"
+
+CPU_COUNT = os.cpu_count() or 1
+POOL_SIZE = CPU_COUNT
+FFMPEG_BATCH_SIZE = 32
+
+@dataclass
+class Result:
+    status: str
+    name: str
+
+
+@dataclass
+class ConvertStats:
+    converted: int = 0
+    copied: int = 0
+    cached: int = 0
+    skipped: int = 0
+    failed: int = 0
+    correct_format_files: list = field(default_factory=list)
+    cached_files: list = field(default_factory=list)
+    skipped_files: list = field(default_factory=list)
+    failed_files: list = field(default_factory=list)
+
+    def add(self, result: Result):
+        setattr(self, result.status, getattr(self, result.status) + 1)
+        if result.status == "copied":
+            self.correct_format_files.append(result.name)
+        elif result.status == "cached":
+            self.cached_files.append(result.name)
+        elif result.status == "skipped":
+            self.skipped_files.append(result.name)
+        elif result.status == "failed":
+            self.failed_files.append(result.name)
+
+
+@dataclass
+class JobConfig:
+    threads: int = None
+    hw_encoder: str = None
+    hw_slots: object = None
+
+
+job_config = JobConfig()
+
+
+class ConversionCache:
+    def __init__(self, out_dir: Path):
+        self.path = out_dir / CACHE_FILE
+        try:
+            self.entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def key(src: Path, dest_ext):
+        try:
+            st = src.stat()
+            return f"{src.resolve()}|{st.st_size}|{st.st_mtime_ns}|{dest_ext}"
+        except OSError:
+            return None
+
+    def lookup(self, src: Path, dest_ext):
+        name = self.entries.get(self.key(src, dest_ext))
+        return name is not None and (self.path.parent / name).exists()
+
+    def store(self, src: Path, dest_ext, dest: Path):
+        key = self.key(src, dest_ext)
+        if key is not None:
+            self.entries[key] = dest.name
+
+    def save(self):
+        try:
+            self.path.write_text(json.dumps(self.entries, indent=2))
+        except OSError:
+            pass
+
+    def filter_pending(self, files, dest_ext, stats: ConvertStats):
+        pending = []
+        for f in files:
+            if self.lookup(f, dest_ext):
+                print(f"Skipped (already converted): {f.name}")
+                stats.add(Result("cached", f.name))
+            else:
+                pending.append(f)
+        return pending
 
 
 def get_target():
@@ -48,15 +169,29 @@ def get_output_folder(default_dir):
     return out_path, True
 
 
+def find_ffmpeg():
+    path = shutil.which("ffmpeg")
+    if path or imageio_ffmpeg is None:
+        return path
+    try:
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except RuntimeError:
+        return None
+
+
+FFMPEG = find_ffmpeg()
+FFPROBE = shutil.which("ffprobe")
+
+
+def check_media_tools():
+    missing = [name for name, path in (("ffmpeg", FFMPEG), ("ffprobe", FFPROBE)) if not path]
+    if missing:
+        sys.exit(f"Could not find {' and '.join(missing)}. Install FFmpeg and make sure "
+                 f"{' and '.join(missing)} {'is' if len(missing) == 1 else 'are'} on your PATH.")
+
+
 def detect_type(file_path: Path):
-    ext = file_path.suffix.lower()
-    if ext in VIDEO_EXTS:
-        return "video"
-    if ext in AUDIO_EXTS:
-        return "audio"
-    if ext in IMAGE_EXTS:
-        return "image"
-    return None
+    return EXT_TO_TYPE.get(file_path.suffix.lower())
 
 def audio_codec_for_ext(ext: str):
     return {
@@ -67,105 +202,367 @@ def audio_codec_for_ext(ext: str):
         ".ogg": "libvorbis"
     }.get(ext, "aac")
 
+def copyable_audio_codecs(ext: str):
+    return {
+        ".mp3": {"mp3"},
+        ".wav": {"pcm_s16le"},
+        ".m4a": {"aac", "alac"},
+        ".flac": {"flac"},
+        ".ogg": {"vorbis", "opus"}
+    }.get(ext, set())
+
+def remuxable_codecs(ext: str):
+    return {
+        ".mp4": {"h264", "hevc", "aac", "mp3"},
+        ".mov": {"h264", "hevc", "aac", "mp3"},
+        ".mkv": {"h264", "hevc", "vp9", "av1", "aac", "mp3", "opus", "vorbis", "flac"},
+        ".webm": {"vp8", "vp9", "av1", "opus", "vorbis"}
+    }.get(ext, set())
+
+def probe_codecs(src: Path):
+    result = subprocess.run(
+        [FFPROBE, "-v", "error", "-show_entries", "stream=codec_name,codec_type",
+         "-of", "csv=p=0", str(src)],
+        check=True, capture_output=True, text=True)
+    codecs = {}
+    for line in result.stdout.splitlines():
+        name, _, ctype = line.strip().partition(",")
+        if ctype and ctype not in codecs:
+            codecs[ctype] = name
+    return codecs
+
+def probe_audio_codec(src: Path):
+    result = subprocess.run(
+        [FFPROBE, "-v", "error", "-select_streams", "a:0",
+         "-show_entries", "stream=codec_name", "-of", "csv=p=0", str(src)],
+        check=True, capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def prefetch(path: Path):
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def fast_copy(src: Path, dest: Path):
+    if hasattr(os, "copy_file_range"):
+        try:
+            with src.open("rb") as fin, dest.open("wb") as fout:
+                remaining = os.fstat(fin.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fin.fileno(), fout.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dest)
+                return
+        except OSError:
+            pass
+    shutil.copy2(src, dest)
+
 
 def copy_same_format(src: Path, dest: Path):
     if src.suffix.lower() == dest.suffix.lower():
-        if dest.exists(): dest = get_unique_file_path(dest)
-        shutil.copy2(src, dest)
-        summary["copied"] += 1
-        correct_format_files.append(dest.name)
+        fast_copy(src, dest)
         print(f"Copied (already correct format): {src.name}")
         return True
     return False
 
 
+def _run_ffmpeg(args):
+    subprocess.run([FFMPEG, "-y", "-nostdin", "-hide_banner", "-loglevel", "error", *args], check=True)
+
+
+def thread_args():
+    return ["-threads", str(job_config.threads)] if job_config.threads else []
+
+
+@lru_cache(maxsize=None)
+def available_encoders():
+    try:
+        result = subprocess.run([FFMPEG, "-hide_banner", "-encoders"],
+                                check=True, capture_output=True, text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+    _, _, listing = result.stdout.partition("------")
+    return frozenset(line.split()[1] for line in listing.splitlines() if len(line.split()) > 1)
+
+
+def hw_encoder_args(encoder):
+    args = ["-c:v", encoder, *HW_QUALITY_ARGS[encoder]]
+    if encoder.endswith("_vaapi"):
+        return ["-vaapi_device", VAAPI_DEVICE, "-vf", "format=nv12,hwupload", *args]
+    return args
+
+
+def software_encoder_args(ext: str):
+    if ext == ".webm":
+        return ["-c:v", "libvpx-vp9", "-deadline", "realtime", "-cpu-used", "5"]
+    return ["-c:v", "libx264", "-preset", "veryfast", "-crf", "23", "-pix_fmt", "yuv420p"]
+
+
+def video_family(ext: str):
+    return "vp9" if ext == ".webm" else "h264"
+
+
+def hw_encoder_works(encoder):
+    if encoder not in available_encoders():
+        return False
+    if encoder.endswith("_vaapi") and not os.path.exists(VAAPI_DEVICE):
+        return False
+    try:
+        subprocess.run([FFMPEG, "-nostdin", "-hide_banner", "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1",
+                        *hw_encoder_args(encoder), "-frames:v", "1", "-f", "null", "-"],
+                       check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def detect_hw_encoder(family):
+    return next((e for e in HW_VIDEO_ENCODERS[family] if hw_encoder_works(e)), None)
+
+
+def job_config_for(worker, dest_ext, workers=None):
+    config = JobConfig()
+    if workers:
+        config.threads = max(1, CPU_COUNT // workers)
+    if worker is _worker_v2v:
+        config.hw_encoder = detect_hw_encoder(video_family(f".{dest_ext}"))
+        if config.hw_encoder and workers and workers > HW_ENCODE_SESSIONS:
+            config.hw_slots = multiprocessing.Semaphore(HW_ENCODE_SESSIONS)
+    return config
+
+
 def convert_video_to_video(src: Path, dest: Path):
-    clip = VideoFileClip(str(src))
-    audio_present = clip.audio is not None
-    if dest.suffix.lower() == ".webm":
-       clip.write_videofile(str(dest), codec="libvpx-vp9", audio_codec="libopus" if audio_present else None) 
-    else: clip.write_videofile(str(dest), codec="libx264", audio_codec="aac" if audio_present else None)
-    clip.close()
-    summary["converted"] += 1
+    codecs = probe_codecs(src)
+    allowed = remuxable_codecs(dest.suffix.lower())
+    audio = codecs.get("audio")
+    if codecs.get("video") in allowed and (audio is None or audio in allowed):
+        try:
+            _run_ffmpeg(["-i", str(src), "-map", "0:v:0", "-map", "0:a:0?", "-c", "copy", str(dest)])
+            print(f"Remuxed (no re-encode needed): {src.name}")
+            return "converted"
+        except subprocess.CalledProcessError:
+            print(f"Remux failed, re-encoding instead: {src.name}")
+
+    ext = dest.suffix.lower()
+    args = ["-i", str(src), "-map", "0:v:0", "-map", "0:a:0?"]
+    output_args = ["-c:a", "libopus" if ext == ".webm" else "aac", *thread_args(), str(dest)]
+    encoder = job_config.hw_encoder
+    slots = job_config.hw_slots
+    if encoder and (slots is None or slots.acquire(block=False)):
+        try:
+            _run_ffmpeg([*args, *hw_encoder_args(encoder), *output_args])
+            return "converted"
+        except subprocess.CalledProcessError:
+            print(f"{encoder} failed, retrying with software encoder: {src.name}")
+        finally:
+            if slots is not None:
+                slots.release()
+    _run_ffmpeg([*args, *software_encoder_args(ext), *output_args])
+    return "converted"
 
 
 def convert_video_to_audio(src: Path, dest: Path):
-    clip = VideoFileClip(str(src))
-    if clip.audio is None:
-        clip.close()
-        summary["skipped"] += 1
-        skipped_files.append(src.name)
+    src_codec = probe_audio_codec(src)
+    if src_codec is None:
         print(f"Skipped (no audio): {src.name}")
-        return
-    codec = audio_codec_for_ext(dest.suffix.lower())
-    clip.audio.write_audiofile(str(dest), codec=codec)
-    clip.close()
-    summary["converted"] += 1
+        return "skipped"
+    ext = dest.suffix.lower()
+    args = ["-i", str(src), "-map", "0:a:0"]
+    if src_codec in copyable_audio_codecs(ext):
+        args += ["-c:a", "copy"]
+    else:
+        args += ["-c:a", audio_codec_for_ext(ext), "-threads", "1"]
+    _run_ffmpeg([*args, str(dest)])
+    return "converted"
 
 def convert_audio_to_audio(src: Path, dest: Path):
-    clip = AudioFileClip(str(src))
     codec = audio_codec_for_ext(dest.suffix.lower())
-    clip.write_audiofile(str(dest), codec=codec)
-    clip.close()
-    summary["converted"] += 1
+    _run_ffmpeg(["-i", str(src), "-vn", "-c:a", codec, "-threads", "1", str(dest)])
+    return "converted"
+
+def audio_batch_args(srcs, dests):
+    args = []
+    for src in srcs:
+        args += ["-i", str(src)]
+    for i, dest in enumerate(dests):
+        codec = audio_codec_for_ext(dest.suffix.lower())
+        args += ["-map", f"{i}:a:0", "-map_metadata", str(i), "-map_chapters", str(i),
+                 "-c:a", codec, "-threads", "1", str(dest)]
+    return args
+
+def convert_audio_batch(srcs, dests):
+    _run_ffmpeg(audio_batch_args(srcs, dests))
+
+def image_save_kwargs(ext: str):
+    if ext == ".png":
+        return {"compress_level": 1}
+    if ext in JPEG_EXTS:
+        return {"quality": JPEG_QUALITY, "optimize": False, "progressive": False}
+    return {}
+
+def decode_jpeg(src: Path):
+    try:
+        return simplejpeg.decode_jpeg(src.read_bytes(), colorspace="RGB")
+    except (ValueError, RuntimeError):
+        return None
+
+def encode_jpeg_pixels(pixels):
+    return simplejpeg.encode_jpeg(pixels, quality=JPEG_QUALITY, colorspace="RGB", colorsubsampling="420")
+
+def encode_jpeg(img):
+    if simplejpeg:
+        return encode_jpeg_pixels(np.asarray(img))
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", **image_save_kwargs(".jpg"))
+    return buf.getvalue()
+
+def write_jpeg(dest: Path, data: bytes):
+    if OPTIMIZE_JPEG and JPEGTRAN:
+        try:
+            with dest.open("wb") as out:
+                subprocess.run([JPEGTRAN, "-copy", "none", "-optimize", "-progressive"],
+                               input=data, stdout=out, check=True)
+            return
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"jpegtran failed, writing unoptimized JPEG: {dest.name} - {e}")
+    dest.write_bytes(data)
 
 def convert_image_to_image(src: Path, dest: Path):
+    src_jpeg = src.suffix.lower() in JPEG_EXTS
+    dest_jpeg = dest.suffix.lower() in JPEG_EXTS
+    pixels = decode_jpeg(src) if simplejpeg and src_jpeg and dest_jpeg else None
+    if pixels is not None:
+        write_jpeg(dest, encode_jpeg_pixels(pixels))
+        return "converted"
     img = Image.open(src)
-    if dest.suffix.lower() in {".jpg", ".jpeg"} and img.mode != "RGB":
+    if dest_jpeg and img.mode != "RGB":
         img = img.convert("RGB")
-    img.save(dest)
+    if dest_jpeg:
+        write_jpeg(dest, encode_jpeg(img))
+    else:
+        img.save(dest, **image_save_kwargs(dest.suffix.lower()))
     img.close()
-    summary["converted"] += 1
+    return "converted"
 
-def convert_single_file(src: Path, out_dir: Path):
-    ftype = detect_type(src)
-    if not ftype:
-        print(f"Skipped (unsupported type): {src.name}")
-        summary["skipped"] += 1
-        skipped_files.append(src.name)
-        return
+def configure_jobs(config: JobConfig):
+    global job_config
+    job_config = config
 
-    print(f"Detected file type: {ftype.upper()}")
 
+def _run_worker(convert, src: Path, dest: Path):
     try:
-        if ftype == "video":
-            choice = choose_conversion_for_video()
-            if choice == "1":
-                dest_ext = choose_extension(ftype)
-                dest = get_unique_file_path(out_dir / f"{src.stem}.{dest_ext}")
-                if copy_same_format(src, dest):
-                    return
-                convert_video_to_video(src, dest)
+        if copy_same_format(src, dest):
+            return Result("copied", dest.name)
+        return Result(convert(src, dest), src.name)
+    except Exception as e:
+        print(f"Failed: {src.name} - {e}")
+        return Result("failed", src.name)
 
-            else:
-                dest_ext = choose_extension("audio")
-                dest = get_unique_file_path(out_dir / f"{src.stem}.{dest_ext}")
-                if copy_same_format(src, dest):
-                    return
-                convert_video_to_audio(src, dest)
-
-        elif ftype == "audio":
-            dest_ext = choose_extension(ftype)
-            dest = get_unique_file_path(out_dir / f"{src.stem}.{dest_ext}")
-            if copy_same_format(src, dest):
-                return
-            convert_audio_to_audio(src, dest)
 
-        elif ftype == "image":
-            dest_ext = choose_extension(ftype)
-            dest = get_unique_file_path(out_dir / f"{src.stem}.{dest_ext}")
-            if copy_same_format(src, dest):
-                return
-            convert_image_to_image(src, dest)
+def _worker_v2v(src: Path, dest: Path):
+    return _run_worker(convert_video_to_video, src, dest)
+
+
+def _worker_v2a(src: Path, dest: Path):
+    return _run_worker(convert_video_to_audio, src, dest)
+
+
+def _worker_a2a(src: Path, dest: Path):
+    return _run_worker(convert_audio_to_audio, src, dest)
+
+
+def _worker_a2a_batch(srcs, dests):
+    if len(srcs) > 1:
+        try:
+            convert_audio_batch(srcs, dests)
+            return [Result("converted", src.name) for src in srcs]
+        except Exception as e:
+            print(f"Batch failed, retrying files one at a time - {e}")
+    return [_worker_a2a(src, dest) for src, dest in zip(srcs, dests)]
 
-    except Exception as e:
-        print(f"Failed to convert {src.name}: {e}")
-        summary["failed"] += 1
-        failed_files.append(src.name)
 
+def _worker_i2i(src: Path, dest: Path):
+    return _run_worker(convert_image_to_image, src, dest)
 
-def convert_folder(folder: Path, out_dir: Path):
-    files = [f for f in folder.iterdir() if f.is_file()]
+
+def _worker_unit(worker, srcs, dests):
+    return [worker(src, dest) for src, dest in zip(srcs, dests)]
+
+
+def choose_worker(ftype):
+    if ftype == "video":
+        if choose_conversion_for_video() == "1":
+            return _worker_v2v, choose_extension("video")
+        return _worker_v2a, choose_extension("audio")
+    if ftype == "audio":
+        return _worker_a2a, choose_extension(ftype)
+    return _worker_i2i, choose_extension(ftype)
+
+
+def resolve_destinations(files, out_dir: Path, dest_ext):
+    dests = []
+    existing = existing_names(out_dir)
+    for f in files:
+        dest = get_unique_file_path(out_dir / f"{f.stem}.{dest_ext}", existing)
+        existing.add(dest.name.casefold())
+        dests.append(dest)
+    return dests
+
+
+def plan_audio_batches(files, dests):
+    src_batches, dest_batches, pending = [], [], []
+    for f, dest in zip(files, dests):
+        if f.suffix.lower() == dest.suffix.lower():
+            src_batches.append([f])
+            dest_batches.append([dest])
+        else:
+            pending.append((f, dest))
+
+    size = min(FFMPEG_BATCH_SIZE, max(1, -(-len(pending) // POOL_SIZE)))
+    for i in range(0, len(pending), size):
+        chunk = pending[i:i + size]
+        src_batches.append([f for f, _ in chunk])
+        dest_batches.append([dest for _, dest in chunk])
+    return src_batches, dest_batches
+
+
+def convert_single_file(src: Path, out_dir: Path, stats: ConvertStats):
+    ftype = detect_type(src)
+    if not ftype:
+        print(f"Skipped (unsupported type): {src.name}")
+        stats.add(Result("skipped", src.name))
+        return
+
+    print(f"Detected file type: {ftype.upper()}")
+
+    worker, dest_ext = choose_worker(ftype)
+    cache = ConversionCache(out_dir)
+    if not cache.filter_pending([src], dest_ext, stats):
+        return
+    configure_jobs(job_config_for(worker, dest_ext))
+    dest = get_unique_file_path(out_dir / f"{src.stem}.{dest_ext}")
+    result = worker(src, dest)
+    stats.add(result)
+    if result.status in ("converted", "copied"):
+        cache.store(src, dest_ext, dest)
+        cache.save()
+
+def convert_folder(folder: Path, out_dir: Path, stats: ConvertStats):
+    with os.scandir(folder) as entries:
+        files = [Path(e.path) for e in entries if e.is_file() and e.name != CACHE_FILE]
     types = {"video": [], "audio": [], "image": []}
 
     for f in files:
@@ -173,111 +570,58 @@ def convert_folder(folder: Path, out_dir: Path):
         if ftype:
             types[ftype].append(f)
         else:
-            skipped_files.append(f.name)
             print(f"Skipped (unsupported type): {f.name}")
-            summary["skipped"] += 1
+            stats.add(Result("skipped", f.name))
 
     non_empty = {k: v for k, v in types.items() if v}
 
     if len(non_empty) == 1:
         ftype = list(non_empty.keys())[0]
         print(f"Folder contains only {ftype} files.")
-        convert_all_same_type(ftype, non_empty[ftype], out_dir)
+        convert_all_same_type(ftype, non_empty[ftype], out_dir, stats)
 
     else:
         print("Folder contains multiple file types.")
         for ftype, flist in non_empty.items():
-
             print(f"\n{ftype.upper()} files found: {len(flist)}")
+            convert_all_same_type(ftype, flist, out_dir, stats)
 
-            if ftype == "video":
-                choice = choose_conversion_for_video()
-                if choice == "1":
-                    dest_ext = choose_extension(ftype)
-                    for f in flist:
-                        dest = get_unique_file_path(out_dir / f"{f.stem}.{dest_ext}")
-                        if copy_same_format(f, dest):
-                            continue
-                        convert_video_to_video(f, dest)
-                else:
-                    dest_ext = choose_extension("audio")
-                    for f in flist:
-                        dest = get_unique_file_path(out_dir / f"{f.stem}.{dest_ext}")
-                        if copy_same_format(f, dest):
-                            continue
-                        convert_video_to_audio(f, dest)
-
-            elif ftype == "audio":
-                dest_ext = choose_extension(ftype)
-                for f in flist:
-                    dest = get_unique_file_path(out_dir / f"{f.stem}.{dest_ext}")
-                    if copy_same_format(f, dest):
-                        continue
-                    convert_audio_to_audio(f, dest)
-
-            elif ftype == "image":
-                dest_ext = choose_extension(ftype)
-                for f in flist:
-                    dest = get_unique_file_path(out_dir / f"{f.stem}.{dest_ext}")
-                    if copy_same_format(f, dest):
-                        continue
-                    convert_image_to_image(f, dest)
-
-def convert_all_same_type(ftype, files, out_dir):
-    if ftype == "video":
-        choice = choose_conversion_for_video()
-
-        if choice == "1":
-            dest_ext = choose_extension(ftype)
-            for f in files:
-                dest = get_unique_file_path(out_dir / f"{f.stem}.{dest_ext}")
-                if copy_same_format(f, dest):
-                    continue
-                try:
-                    convert_video_to_video(f, dest)
-                except Exception as e:
-                    print(f"Failed: {f.name} - {e}")
-                    summary["failed"] += 1
-                    failed_files.append(f.name)
-
-        else:
-            dest_ext = choose_extension("audio")
-            for f in files:
-                dest = get_unique_file_path(out_dir / f"{f.stem}.{dest_ext}")
-                if copy_same_format(f, dest):
-                    continue
-                try:
-                    convert_video_to_audio(f, dest)
-                except Exception as e:
-                    print(f"Failed: {f.name} - {e}")
-                    summary["failed"] += 1
-                    failed_files.append(f.name)
-
-    elif ftype == "audio":
-        dest_ext = choose_extension(ftype)
-        for f in files:
-            dest = get_unique_file_path(out_dir / f"{f.stem}.{dest_ext}")
-            if copy_same_format(f, dest):
-                continue
-            try:
-                convert_audio_to_audio(f, dest)
-            except Exception as e:
-                print(f"Failed: {f.name} - {e}")
-                summary["failed"] += 1
-                failed_files.append(f.name)
-
-    elif ftype == "image":
-        dest_ext = choose_extension(ftype)
-        for f in files:
-            dest = get_unique_file_path(out_dir / f"{f.stem}.{dest_ext}")
-            if copy_same_format(f, dest):
-                continue
+def convert_all_same_type(ftype, files, out_dir, stats: ConvertStats):
+    worker, dest_ext = choose_worker(ftype)
+    cache = ConversionCache(out_dir)
+    files = cache.filter_pending(files, dest_ext, stats)
+    if not files:
+        return
+    dests = resolve_destinations(files, out_dir, dest_ext)
+    if worker is _worker_a2a:
+        src_batches, dest_batches = plan_audio_batches(files, dests)
+    else:
+        src_batches, dest_batches = [[f] for f in files], [[d] for d in dests]
+    workers = min(POOL_SIZE, len(src_batches))
+    config = job_config_for(worker, dest_ext, workers)
+    unit_worker = _worker_a2a_batch if worker is _worker_a2a else partial(_worker_unit, worker)
+    with ProcessPoolExecutor(max_workers=workers, initializer=configure_jobs, initargs=(config,)) as ex:
+        futures = {ex.submit(unit_worker, srcs, unit_dests): i
+                   for i, (srcs, unit_dests) in enumerate(zip(src_batches, dest_batches))}
+        pool_broken = False
+        for completed, future in enumerate(as_completed(futures)):
+            i = futures[future]
+            upcoming = completed + workers
+            if upcoming < len(src_batches):
+                for src in src_batches[upcoming]:
+                    prefetch(src)
             try:
-                convert_image_to_image(f, dest)
-            except Exception as e:
-                print(f"Failed: {f.name} - {e}")
-                summary["failed"] += 1
-                failed_files.append(f.name)
+                batch = future.result()
+            except BrokenProcessPool as e:
+                if not pool_broken:
+                    print(f"Worker process died, marking unfinished files as failed - {e}")
+                    pool_broken = True
+                batch = [Result("failed", src.name) for src in src_batches[i]]
+            for src, dest, result in zip(src_batches[i], dest_batches[i], batch):
+                stats.add(result)
+                if result.status in ("converted", "copied"):
+                    cache.store(src, dest_ext, dest)
+    cache.save()
 
 def choose_conversion_for_video():
     while True:
@@ -290,71 +634,71 @@ def choose_conversion_for_video():
         print("Invalid Selection")
 
 def choose_extension(ftype):
-    if ftype == "video":
-        while True:
-            dest_ext = input("Enter video extension of output (mp4, mov, avi, mkv, webm): ").strip().lower()
-            if dest_ext in ("mp4", "mov", "avi", "mkv", "webm"):
-                return dest_ext
-            print("Invalid Selection")
-    elif ftype == "audio":
-        while True:
-            dest_ext = input("Enter audio extension of output (mp3, wav, m4a, flac, ogg): ").strip().lower()
-            if dest_ext in ("mp3", "wav", "m4a", "flac", "ogg"):
-                return dest_ext
-            print("Invalid Selection")
-    elif ftype == "image":
-        while True:
-            dest_ext = input("Enter image extension of output (png, jpg, jpeg, bmp, gif, tiff): ").strip().lower()
-            if dest_ext in ("png", "jpg", "jpeg", "webp", "bmp", "gif", "tiff"):
-                return dest_ext
-            print("Invalid Selection")
-
-
-def print_summary():
-    print("\n==== SUMMARY ====")
-    print(f"Converted: {summary['converted']}")
-    print(f"Copied (already correct format): {summary['copied']}")
-    if summary["copied"] > 0:
-        print("  - Files already correct format:")
-        for f in correct_format_files:
-            print(f"    • {f}")
-
-    print(f"Skipped: {summary['skipped']}")
-    if summary["skipped"] > 0:
-        print("  - Skipped files:")
-        for f in skipped_files:
-            print(f"    • {f}")
-    print(f"Failed: {summary['failed']}")
-    if summary["failed"] > 0:
-        print("  - Failed files:")
-        for f in failed_files:
-            print(f"    • {f}")
-
-    print("=================")
+    valid = OUTPUT_EXTS[ftype]
+    prompt = f"Enter {ftype} extension of output ({', '.join(valid)}): "
+    while True:
+        dest_ext = input(prompt).strip().lower()
+        if dest_ext in valid:
+            return dest_ext
+        print("Invalid Selection")
+
+
+def print_summary(stats: ConvertStats):
+    lines = ["", "==== SUMMARY ====",
+             f"Converted: {stats.converted}",
+             f"Copied (already correct format): {stats.copied}"]
+    if stats.copied > 0:
+        lines.append("  - Files already correct format:")
+        lines.extend(f"    • {f}" for f in stats.correct_format_files)
+
+    if stats.cached > 0:
+        lines.append(f"Cached (already converted): {stats.cached}")
+        lines.append("  - Cached files:")
+        lines.extend(f"    • {f}" for f in stats.cached_files)
+
+    lines.append(f"Skipped: {stats.skipped}")
+    if stats.skipped > 0:
+        lines.append("  - Skipped files:")
+        lines.extend(f"    • {f}" for f in stats.skipped_files)
+    lines.append(f"Failed: {stats.failed}")
+    if stats.failed > 0:
+        lines.append("  - Failed files:")
+        lines.extend(f"    • {f}" for f in stats.failed_files)
+
+    lines.append("=================")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def existing_names(folder: Path):
+    try:
+        with os.scandir(folder) as entries:
+            return {e.name.casefold() for e in entries}
+    except FileNotFoundError:
+        return set()
 
 def get_unique_output_folder(base_dir: Path) -> Path:
-    if not base_dir.exists():
+    existing = existing_names(base_dir.parent)
+    if base_dir.name.casefold() not in existing:
         return base_dir
 
     i = 1
-    while True:
-        candidate = base_dir.parent / f"{base_dir.name} ({i})"
-        if not candidate.exists():
-            return candidate
+    while f"{base_dir.name} ({i})".casefold() in existing:
         i += 1
+    return base_dir.parent / f"{base_dir.name} ({i})"
 
-def get_unique_file_path(dest: Path) -> Path:
-    if not dest.exists():
+def get_unique_file_path(dest: Path, existing=None) -> Path:
+    if existing is None:
+        existing = existing_names(dest.parent)
+    if dest.name.casefold() not in existing:
         return dest
 
     i = 1
-    while True:
-        candidate = dest.parent / f"{dest.stem} ({i}){dest.suffix}"
-        if not candidate.exists():
-            return candidate
+    while f"{dest.stem} ({i}){dest.suffix}".casefold() in existing:
         i += 1
+    return dest.parent / f"{dest.stem} ({i}){dest.suffix}"
 
 def main():
+    check_media_tools()
+    stats = ConvertStats()
     target = get_target()
 
     if target.is_file():
@@ -367,15 +711,15 @@ def main():
     out_dir.mkdir(parents=True, exist_ok=True)
 
     if target.is_file():
-        convert_single_file(target, out_dir)
+        convert_single_file(target, out_dir, stats)
 
     elif target.is_dir():
-        convert_folder(target, out_dir)
+        convert_folder(target, out_dir, stats)
     else:
         print("Target is neither a file nor folder.")
-        summary["failed"] += 1
+        stats.failed += 1
 
-    print_summary()
+    print_summary(stats)
 
 if __name__ == "__main__":
     main()